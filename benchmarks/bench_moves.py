@@ -0,0 +1,97 @@
+"""
+Benchmark for move scheduling and durable mode in FolderStructure.
+
+Creates a tree of empty files spread over many source folders, plans where
+each file goes in {category: {date: [files]}} order like FileSorter does, and
+times the moves with and without scheduling and durability:
+
+    python benchmarks/bench_moves.py --files 20000 --folders 200 --dir /var/tmp
+
+Use --dir to point at the file system you want to measure; /tmp is often a
+RAM-backed tmpfs where fsync costs nothing.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.folder_structure import FolderStructure
+from src.utils import fsync_directory
+
+CATEGORIES = ['images', 'videos', 'documents', 'audio', 'scripts']
+
+
+def create_tree(base_folder, files, folders):
+    """Creates the source files and returns them sorted as {category: {date: [files]}}."""
+    sorted_files = {}
+    per_folder = max(files // folders, 1)
+    for folder in range(folders):
+        folder_path = os.path.join(base_folder, f"source{folder}")
+        os.makedirs(folder_path)
+        for index in range(per_folder):
+            file_path = os.path.join(folder_path, f"file{index}")
+            open(file_path, 'w').close()
+            # Files in one folder span a few dates, as photos from a few days would
+            date = f"2024-01-{(folder + index * 3 // per_folder) % 28 + 1:02d}"
+            sorted_files.setdefault(CATEGORIES[index % len(CATEGORIES)], {}).setdefault(date, []).append(file_path)
+    return sorted_files
+
+
+def move_unscheduled(folder_structure, sorted_files, fsync_per_file=False):
+    """Moves files in category, then date order, one at a time, as organize_files did before scheduling."""
+    for category, dates in sorted_files.items():
+        for date, files in dates.items():
+            for file in files:
+                file_folder, file_name = os.path.split(file)
+                relative_folder = os.path.relpath(file_folder, folder_structure.base_folder)
+                dest_folder = os.path.join(folder_structure.base_folder, category, date, relative_folder)
+                folder_structure.create_directory(dest_folder)
+                dest_path = folder_structure.resolve_duplicate_file(os.path.join(dest_folder, file_name))
+                shutil.move(file, dest_path)
+                if fsync_per_file:
+                    fsync_directory(file_folder)
+                    fsync_directory(dest_folder)
+
+
+SCENARIOS = [
+    ("unscheduled", lambda fs, sf: move_unscheduled(fs, sf)),
+    ("scheduled", lambda fs, sf: fs.organize_files(sf)),
+    ("unscheduled + fsync per file", lambda fs, sf: move_unscheduled(fs, sf, fsync_per_file=True)),
+    ("scheduled + durable", lambda fs, sf: fs.organize_files(sf, durable=True)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark move scheduling and durable mode.")
+    parser.add_argument("--files", type=int, default=20000, help="Number of files to move")
+    parser.add_argument("--folders", type=int, default=200, help="Number of source folders")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario; the fastest is reported")
+    parser.add_argument("--dir", default=None, help="Folder to create the test tree in")
+    args = parser.parse_args()
+
+    work_folder = tempfile.mkdtemp(prefix="bench_moves_", dir=args.dir)
+    base_folder = os.path.join(work_folder, "tree")
+    try:
+        print(f"{args.files} files in {args.folders} folders under {work_folder}, best of {args.repeat}")
+        for name, run in SCENARIOS:
+            timings = []
+            for _ in range(args.repeat):
+                shutil.rmtree(base_folder, ignore_errors=True)
+                sorted_files = create_tree(base_folder, args.files, args.folders)
+                if hasattr(os, 'sync'):
+                    os.sync()
+                start = time.perf_counter()
+                run(FolderStructure(base_folder), sorted_files)
+                timings.append(time.perf_counter() - start)
+            print(f"{name:30s} {min(timings):8.3f}s")
+    finally:
+        shutil.rmtree(work_folder)
+
+
+if __name__ == "__main__":
+    main()
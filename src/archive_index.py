@@ -0,0 +1,48 @@
+import os
+import json
+from typing import Dict, Optional, Tuple
+
+
+ARCHIVE_FORMATS = ('tar.zst', 'tar.gz', 'zip')
+INDEX_SUFFIX = '.index.json'
+
+
+def read_index(bundle_path: str) -> Dict:
+    """Returns the index sidecar of a bundle without touching the bundle itself."""
+    with open(bundle_path + INDEX_SUFFIX, 'r') as fh:
+        return json.load(fh)
+
+
+def is_bundle(file_path: str) -> bool:
+    """Returns True if the path is an archive bundle with an index sidecar."""
+    return file_path.endswith(tuple('.' + fmt for fmt in ARCHIVE_FORMATS)) \
+        and os.path.isfile(file_path + INDEX_SUFFIX)
+
+
+def is_index_sidecar(file_path: str) -> bool:
+    """Returns True if the path is the index sidecar of a bundle, based on its name."""
+    return file_path.endswith(tuple('.' + fmt + INDEX_SUFFIX for fmt in ARCHIVE_FORMATS))
+
+
+def is_archive_file(file_path: str) -> bool:
+    """
+    Returns True if the path is a bundle or an index sidecar.
+
+    A bundle and its sidecar belong together in the category folder, next to the
+    date folder they were made from, so organizing never moves either of them.
+    """
+    return is_index_sidecar(file_path) or is_bundle(file_path)
+
+
+def split_member_path(file_path: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits a path pointing inside a bundle into (bundle path, member name).
+
+    :return: Tuple of bundle path and member name, or None if the path is not inside a bundle
+    """
+    parts = file_path.split(os.sep)
+    for i in range(len(parts) - 1, 0, -1):
+        candidate = os.sep.join(parts[:i])
+        if is_bundle(candidate):
+            return candidate, '/'.join(parts[i:])
+    return None
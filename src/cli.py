@@ -1,9 +1,13 @@
 import argparse
+import json
 import os
 from file_classifier import FileClassifier
 from file_manager import FileManager
 from file_sorter import FileSorter
 from folder_structure import FolderStructure
+from folder_archiver import FolderArchiver, ARCHIVE_FORMATS
+from ignore_rules import IgnoreRules
+from folder_stats import FolderStats
 from src.utils import setup_logger, handle_error, parse_date
 from colorama import Fore, Style, init
 from rich.console import Console
@@ -36,6 +40,8 @@ def display_help_message():
     table.add_row("sort", "Sort files by 'type' or 'date'")
     table.add_row("organize", "Organize files into folders")
     table.add_row("filter", "Filter files by date range")
+    table.add_row("archive", "Pack old date folders into compressed bundles")
+    table.add_row("stats", "Show counts and sizes of a folder without changing it")
 
     console.print(table)
 
@@ -51,10 +57,73 @@ def get_sort_option():
     
     return sort_option, organize_option == "yes", start_date, end_date
 
+def get_archive_option():
+    older_than_days = Prompt.ask("Archive date folders older than how many days? (leave blank to skip)", default="")
+    archive_format = None
+    if older_than_days:
+        archive_format = Prompt.ask("Which archive format?", choices=list(ARCHIVE_FORMATS), default="tar.gz")
+    return older_than_days, archive_format
+
+def format_size(size):
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def display_stats(stats):
+    console = Console()
+    console.print(f"{stats['files']} files, {format_size(stats['bytes'])}", style="bold")
+
+    for key, title in [("categories", "Category"), ("months", "Month"), ("folders", "Top-level Folder"), ("ages", "Age")]:
+        table = Table(title=f"By {title}")
+        table.add_column(title, style="cyan")
+        table.add_column("Files", justify="right", style="magenta")
+        table.add_column("Size", justify="right", style="magenta")
+        for name, totals in stats[key].items():
+            table.add_row(name, str(totals['files']), format_size(totals['bytes']))
+        console.print(table)
+
+    table = Table(title="Largest Files")
+    table.add_column("File", style="cyan")
+    table.add_column("Size", justify="right", style="magenta")
+    for entry in stats['largest']:
+        table.add_row(entry['path'], format_size(entry['bytes']))
+    console.print(table)
+
+    console.print_json(json.dumps(stats))
+
+def run_stats(folder, ignore_rules, logger):
+    if not os.path.isdir(folder):
+        logger.error(Fore.RED + f"The path '{folder}' is not a valid directory.")
+        return
+    logger.info("Collecting folder statistics...")
+    display_stats(FolderStats(folder, ignore_rules).collect())
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Organize files in a folder by type or date.")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="Only organize files matching this glob (can be repeated)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Skip files and folders matching this gitignore-style glob, "
+                             "in addition to .organizerignore (can be repeated)")
+    parser.add_argument("--durable", action="store_true",
+                        help="Flush folders to disk after each batch of moves so they survive a crash")
+    parser.add_argument("--stats", metavar="FOLDER",
+                        help="Print statistics for FOLDER without changing anything, then exit")
+    return parser.parse_args()
+
 def main():
+    args = parse_arguments()
     logger = setup_logger()
     console = Console()
 
+    if args.stats:
+        try:
+            run_stats(args.stats, IgnoreRules.from_folder(args.stats, args.include, args.exclude), logger)
+        except Exception as e:
+            handle_error(logger, str(e))
+        return
+
     # Display welcome message
     display_welcome_message()
     
@@ -66,6 +135,13 @@ def main():
         elif folder.lower() == 'exit':
             console.print(Fore.GREEN + "Exiting the application. Goodbye!", style="bold")
             break  # Exit the loop
+        elif folder.lower() == 'stats':
+            folder = prompt_user_for_input()
+            try:
+                run_stats(folder, IgnoreRules.from_folder(folder, args.include, args.exclude), logger)
+            except Exception as e:
+                handle_error(logger, str(e))
+            continue  # Return to the beginning of the loop
 
         # Check if folder is a valid directory
         if not os.path.isdir(folder):
@@ -74,12 +150,14 @@ def main():
 
         # Get sorting and organizing options
         sort_option, organize_option, start_date, end_date = get_sort_option()
+        older_than_days, archive_format = get_archive_option()
 
         try:
-            file_manager = FileManager(folder)
+            ignore_rules = IgnoreRules.from_folder(folder, args.include, args.exclude)
+            file_manager = FileManager(folder, ignore_rules)
             file_classifier = FileClassifier()
             file_sorter = FileSorter()
-            folder_structure = FolderStructure(folder)
+            folder_structure = FolderStructure(folder, ignore_rules)
 
             start_date = parse_date(start_date) if start_date else None
             end_date = parse_date(end_date) if end_date else None
@@ -92,21 +170,27 @@ def main():
                     logger.info("Sorting files by type...")
                     categorized_files = file_classifier.classify_files(files)
                     sorted_files = file_sorter.sort_files(categorized_files, folder)
-                    folder_structure.organize_files(sorted_files)
+                    folder_structure.organize_files(sorted_files, durable=args.durable)
                     logger.info(Fore.GREEN + "Files sorted by type successfully.")
                 elif sort_option == SortOption.DATE.value:
                     logger.info("Sorting files by date...")
-                    folder_structure.organize_files_by_date(start_date, end_date)
+                    folder_structure.organize_files_by_date(start_date, end_date, durable=args.durable)
                     logger.info(Fore.GREEN + "Files sorted by date successfully.")
             elif organize_option:
                 logger.info("Organizing files...")
                 categorized_files = file_classifier.classify_files(files)
                 sorted_files = file_sorter.sort_files(categorized_files, folder)
-                folder_structure.organize_files(sorted_files, start_date, end_date)
+                folder_structure.organize_files(sorted_files, start_date, end_date, durable=args.durable)
                 logger.info(Fore.GREEN + "Files organized successfully.")
             else:
                 logger.warning(Fore.YELLOW + "No action specified. Use --sort or --organize.")
 
+            if older_than_days:
+                logger.info(f"Archiving date folders older than {older_than_days} days...")
+                folder_archiver = FolderArchiver(folder, archive_format, ignore_rules=ignore_rules)
+                bundles = folder_archiver.archive_cold_buckets(int(older_than_days))
+                logger.info(Fore.GREEN + f"Created {len(bundles)} archive bundles.")
+
         except Exception as e:
             handle_error(logger, str(e))
 
@@ -1,28 +1,84 @@
 import os
+import sys
 from datetime import datetime
 
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from file_classifier import FileClassifier
+from src.file_classifier import FileClassifier
+from src.archive_index import is_bundle, is_index_sidecar, read_index, split_member_path
+from src.ignore_rules import IgnoreRules, walk_folder_entries
 
 class FileManager:
-    def __init__(self, folder_path):
+    def __init__(self, folder_path, ignore_rules: IgnoreRules = None):
         self.folder_path = folder_path
         self.file_classifier = FileClassifier()
+        self.ignore_rules = ignore_rules or IgnoreRules.from_folder(folder_path)
 
-    def scan_folder(self) -> list:
+    def scan_folder(self, include_archived: bool = False) -> list:
         """
         Recursively scan the folder and return a list of all files, including in subdirectories.
+        Folders excluded by the ignore rules are skipped without being opened.
         
+        :param include_archived: List the members of archive bundles (read from their index
+            sidecars) in place of the bundles themselves
         :return: List of file paths
         """
+        return [file_path for file_path, _ in self.iter_folder(include_archived)]
+
+    def iter_folder(self, include_archived: bool = False, subfolder: str = None, recursive: bool = True):
+        """
+        Lazily scan the folder, yielding one file at a time instead of building a list.
+        
+        :param include_archived: Yield the members of archive bundles in place of the bundles themselves
+        :param subfolder: Optional folder inside the folder to scan instead of the whole folder
+        :param recursive: Whether to descend into subdirectories
+        :return: Iterator of (file path, index entry) tuples; the index entry is None for regular files
+        """
+        for file_path, member, _ in self._iter_entries(include_archived, subfolder, recursive):
+            yield file_path, member
+
+    def iter_file_stats(self, include_archived: bool = False, subfolder: str = None, recursive: bool = True):
+        """
+        Lazily scan the folder, yielding the size and modification time of each file.
+        Stats come from the directory listing where the platform provides them, and
+        files that vanish or cannot be read while scanning are skipped.
+        
+        :param include_archived: Yield the members of archive bundles in place of the bundles themselves
+        :param subfolder: Optional folder inside the folder to scan instead of the whole folder
+        :param recursive: Whether to descend into subdirectories
+        :return: Iterator of (file path, size in bytes, modification timestamp) tuples
+        """
+        for file_path, member, entry in self._iter_entries(include_archived, subfolder, recursive):
+            if member is not None:
+                yield file_path, member['size'], member['modified']
+                continue
+            try:
+                file_stats = entry.stat()
+            except OSError:
+                continue  # Removed or unreadable while scanning
+            yield file_path, file_stats.st_size, file_stats.st_mtime
+
+    def _iter_entries(self, include_archived: bool, subfolder: str, recursive: bool):
+        """
+        Yields (file path, index entry, directory entry) for every file; the index entry is
+        only set for members of archive bundles, which share the directory entry of their bundle.
+        """
         if not os.path.isdir(self.folder_path):
             raise ValueError(f"{self.folder_path} is not a valid directory.")
         
-        file_list = []
-        for root, _, files in os.walk(self.folder_path):
-            for file in files:
-                file_list.append(os.path.join(root, file))
-        return file_list
+        for _, dirs, entries in walk_folder_entries(self.folder_path, self.ignore_rules, subfolder):
+            if not recursive:
+                dirs.clear()
+            for entry in entries:
+                file_path = entry.path
+                if is_index_sidecar(file_path):
+                    continue  # Index sidecars are part of their bundle, not entries of their own
+                if include_archived and is_bundle(file_path):
+                    for member in read_index(file_path)['members']:
+                        yield os.path.join(file_path, *member['name'].split('/')), member, entry
+                    continue
+                yield file_path, None, entry
 
     def get_file_metadata(self, file_name: str) -> dict:
         """
@@ -33,7 +89,10 @@ class FileManager:
         """
         file_path = os.path.join(self.folder_path, file_name)
         if not os.path.exists(file_path):
-            raise FileNotFoundError(f"{file_name} does not exist in {self.folder_path}")
+            archived = split_member_path(file_path)
+            if archived is None:
+                raise FileNotFoundError(f"{file_name} does not exist in {self.folder_path}")
+            return self.get_archived_file_metadata(file_name, *archived)
         
         # Retrieve metadata
         file_stats = os.stat(file_path)
@@ -46,6 +105,28 @@ class FileManager:
         }
         return metadata
 
+    def get_archived_file_metadata(self, file_name: str, bundle_path: str, member_name: str) -> dict:
+        """
+        Retrieve metadata of a file stored in an archive bundle from its index sidecar.
+        
+        :param file_name: Name or path of the file
+        :param bundle_path: Path of the bundle holding the file
+        :param member_name: Name of the file inside the bundle
+        :return: Dictionary with file metadata
+        """
+        for member in read_index(bundle_path)['members']:
+            if member['name'] == member_name:
+                modified = datetime.fromtimestamp(member['modified'])
+                return {
+                    'name': file_name,
+                    'type': os.path.splitext(file_name)[1],
+                    'size': member['size'],
+                    'created': modified,  # Archives keep the modification time only
+                    'modified': modified,
+                    'archive': bundle_path,
+                }
+        raise FileNotFoundError(f"{file_name} does not exist in {self.folder_path}")
+
     def read_file(self, file_name: str) -> str:
         """
         Read and return the contents of a file.
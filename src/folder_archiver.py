@@ -0,0 +1,274 @@
+import os
+import sys
+import json
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+try:
+    import zstandard
+except ImportError:  # tar.zst bundles are only available when zstandard is installed
+    zstandard = None
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.archive_index import ARCHIVE_FORMATS, INDEX_SUFFIX, read_index
+from src.folder_structure import FolderStructure
+from src.ignore_rules import IgnoreRules, walk_folder_entries
+from src.utils import fsync_directory, fsync_file
+
+
+PARTIAL_SUFFIX = '.partial'
+
+
+def _bundle_members(base_folder: str, bucket_path: str, ignore_rules: IgnoreRules) -> List[Dict]:
+    """
+    Lists the files of a bucket that are not ignored as index entries, relative to the bucket.
+
+    Symlinks are skipped in every format: they are neither archived nor removed,
+    so tar and zip bundles hold the same members and dangling links cannot fail a bucket.
+    """
+    members = []
+    subfolder = os.path.relpath(bucket_path, base_folder)
+    for root, _, entries in walk_folder_entries(base_folder, ignore_rules, subfolder):
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if entry.is_symlink():
+                continue
+            file_stats = entry.stat(follow_symlinks=False)
+            members.append({
+                'name': os.path.relpath(entry.path, bucket_path).replace(os.sep, '/'),
+                'size': file_stats.st_size,
+                'modified': file_stats.st_mtime,
+            })
+    return members
+
+
+def _write_tar(bucket_path: str, bundle_path: str, members: List[Dict], archive_format: str) -> None:
+    """Writes the bucket members into a tar.gz or tar.zst bundle."""
+    with open(bundle_path, 'wb') as fh:
+        if archive_format == 'tar.zst':
+            with zstandard.ZstdCompressor().stream_writer(fh, closefd=False) as writer:
+                with tarfile.open(fileobj=writer, mode='w|') as tar:
+                    for member in members:
+                        tar.add(os.path.join(bucket_path, member['name']), arcname=member['name'])
+        else:
+            with tarfile.open(fileobj=fh, mode='w:gz') as tar:
+                for member in members:
+                    tar.add(os.path.join(bucket_path, member['name']), arcname=member['name'])
+
+
+def _read_tar_sizes(bundle_path: str, archive_format: str) -> Dict[str, int]:
+    """Reads every member of a tar bundle to the end and returns their sizes."""
+    sizes = {}
+    with open(bundle_path, 'rb') as fh:
+        if archive_format == 'tar.zst':
+            stream = zstandard.ZstdDecompressor().stream_reader(fh)
+            tar = tarfile.open(fileobj=stream, mode='r|')
+        else:
+            tar = tarfile.open(fileobj=fh, mode='r:gz')
+        with tar:
+            for info in tar:
+                if not info.isfile():
+                    continue
+                extracted = tar.extractfile(info)
+                size = 0
+                for chunk in iter(lambda: extracted.read(1024 * 1024), b''):
+                    size += len(chunk)
+                sizes[info.name] = size
+    return sizes
+
+
+def _verify_bundle(bundle_path: str, members: List[Dict], archive_format: str) -> None:
+    """
+    Checks that a bundle decompresses cleanly and holds exactly the indexed members.
+
+    :raises IOError: If the bundle is corrupt or does not match its index
+    """
+    if archive_format == 'zip':
+        with zipfile.ZipFile(bundle_path) as bundle:
+            bad_member = bundle.testzip()
+            if bad_member is not None:
+                raise IOError(f"Corrupt member '{bad_member}' in {bundle_path}")
+            sizes = {info.filename: info.file_size for info in bundle.infolist()}
+    else:
+        sizes = _read_tar_sizes(bundle_path, archive_format)
+
+    expected = {member['name']: member['size'] for member in members}
+    if sizes != expected:
+        raise IOError(f"Bundle {bundle_path} does not match the files it was built from.")
+
+
+def _build_bundle(base_folder: str, bucket_path: str, bundle_path: str, archive_format: str,
+                  ignore_rules: IgnoreRules) -> Dict:
+    """
+    Compresses one bucket into a partial bundle, flushes it to disk and verifies it.
+    Runs in a worker process; publishing the bundle is left to FolderArchiver.publish_bundle().
+
+    :return: Index describing the bundle and its members, or None if the bucket has nothing to archive
+    """
+    members = _bundle_members(base_folder, bucket_path, ignore_rules)
+    if not members:
+        return None
+    partial_path = bundle_path + PARTIAL_SUFFIX
+    try:
+        if archive_format == 'zip':
+            with zipfile.ZipFile(partial_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+                for member in members:
+                    bundle.write(os.path.join(bucket_path, member['name']), arcname=member['name'])
+        else:
+            _write_tar(bucket_path, partial_path, members, archive_format)
+        fsync_file(partial_path)
+        _verify_bundle(partial_path, members, archive_format)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return {
+        'format': archive_format,
+        'bucket': os.path.basename(bucket_path),
+        'members': members,
+    }
+
+
+class FolderArchiver(FolderStructure):
+    def __init__(self, base_folder, archive_format: str = 'tar.gz', max_workers: int = None,
+                 ignore_rules: IgnoreRules = None):
+        super().__init__(base_folder, ignore_rules)
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format '{archive_format}'. Use one of {', '.join(ARCHIVE_FORMATS)}.")
+        if archive_format == 'tar.zst' and zstandard is None:
+            raise ValueError("The 'tar.zst' format requires the 'zstandard' package.")
+        self.archive_format = archive_format
+        self.max_workers = max_workers
+
+    def resolve_duplicate_bundle(self, bucket_path: str) -> str:
+        """
+        Returns a bundle path for the bucket that does not clash with an existing bundle.
+        Leftovers of an interrupted run under that name, which were never published, are removed.
+        """
+        bundle_path = f"{bucket_path}.{self.archive_format}"
+        counter = 1
+        while os.path.exists(bundle_path):
+            bundle_path = f"{bucket_path} ({counter}).{self.archive_format}"
+            counter += 1
+
+        for leftover in (bundle_path + PARTIAL_SUFFIX, bundle_path + INDEX_SUFFIX,
+                         bundle_path + INDEX_SUFFIX + PARTIAL_SUFFIX):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        return bundle_path
+
+    def publish_bundle(self, bundle_path: str, index: Dict) -> None:
+        """
+        Moves a verified partial bundle into place together with its index sidecar.
+
+        The sidecar is written first, so a published bundle always has an index.
+        Both are flushed to disk before returning, so the originals can be removed safely.
+        """
+        index_path = bundle_path + INDEX_SUFFIX
+        with open(index_path + PARTIAL_SUFFIX, 'w') as fh:
+            json.dump(index, fh, indent=2)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(index_path + PARTIAL_SUFFIX, index_path)
+        os.replace(bundle_path + PARTIAL_SUFFIX, bundle_path)
+        fsync_directory(os.path.dirname(bundle_path) or os.curdir)
+
+    def remove_archived_files(self, bucket_path: str, members: List[Dict]) -> None:
+        """
+        Removes the archived files of a bucket, then the folders they leave empty.
+        Ignored files and folders are never touched.
+        """
+        folders = {bucket_path}
+        for member in members:
+            file_path = os.path.join(bucket_path, *member['name'].split('/'))
+            os.remove(file_path)
+            folder = os.path.dirname(file_path)
+            while folder != bucket_path:
+                folders.add(folder)
+                folder = os.path.dirname(folder)
+
+        # Deepest folders first, so parents are empty by the time they are checked
+        for folder in sorted(folders, key=lambda path: path.count(os.sep), reverse=True):
+            if not os.listdir(folder):
+                os.rmdir(folder)
+
+    def find_cold_buckets(self, older_than_days: int) -> List[str]:
+        """
+        Finds the category/YYYY-MM-DD folders older than the given number of days.
+
+        :param older_than_days: Minimum age of a bucket, based on its folder date
+        :return: List of bucket folder paths
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).strftime('%Y-%m-%d')
+        buckets = []
+        for category in sorted(os.listdir(self.base_folder)):
+            category_path = os.path.join(self.base_folder, category)
+            # Symlinked folders point outside the tree and are never archived or removed
+            if not os.path.isdir(category_path) or os.path.islink(category_path) \
+                    or self.ignore_rules.matches(category, is_dir=True):
+                continue
+            for date in sorted(os.listdir(category_path)):
+                bucket_path = os.path.join(category_path, date)
+                if not os.path.isdir(bucket_path) or os.path.islink(bucket_path) \
+                        or self.ignore_rules.matches(f"{category}/{date}", is_dir=True):
+                    continue
+                try:
+                    datetime.strptime(date, '%Y-%m-%d')
+                except ValueError:
+                    continue  # Not a date bucket
+                if date < cutoff:
+                    buckets.append(bucket_path)
+        return buckets
+
+    def archive_cold_buckets(self, older_than_days: int) -> List[str]:
+        """
+        Packs cold date buckets into compressed bundles, compressing them in parallel.
+
+        Each bundle gets an index sidecar listing its members. The archived files
+        of a bucket are only removed once its bundle has been verified and both the
+        bundle and its index have been flushed to disk. Files excluded by the ignore
+        rules and symlinked folders are neither archived nor removed. A failing bucket
+        does not stop the others; all failures are reported together at the end.
+
+        :param older_than_days: Minimum age of a bucket, based on its folder date
+        :return: List of created bundle paths
+        """
+        buckets = self.find_cold_buckets(older_than_days)
+        if not buckets:
+            return []
+
+        jobs = {bucket_path: self.resolve_duplicate_bundle(bucket_path) for bucket_path in buckets}
+
+        bundles = []
+        failed = []
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                bucket_path: executor.submit(_build_bundle, self.base_folder, bucket_path, bundle_path,
+                                             self.archive_format, self.ignore_rules)
+                for bucket_path, bundle_path in jobs.items()
+            }
+            for bucket_path, future in futures.items():
+                try:
+                    index = future.result()
+                except Exception as e:
+                    failed.append(f"{bucket_path} ({e})")
+                    continue
+                if index is None:
+                    continue  # Only ignored files in this bucket
+                bundle_path = jobs[bucket_path]
+                try:
+                    self.publish_bundle(bundle_path, index)
+                    self.remove_archived_files(bucket_path, index['members'])
+                except OSError as e:
+                    failed.append(f"{bucket_path} ({e})")
+                    continue
+                bundles.append(bundle_path)
+
+        if failed:
+            raise IOError(f"Failed to archive: {', '.join(failed)}")
+        return bundles
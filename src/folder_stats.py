@@ -0,0 +1,200 @@
+import os
+import sys
+import heapq
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.file_manager import FileManager
+from src.ignore_rules import IgnoreRules, walk_folder
+
+
+# How many folder levels below the top a scan may be split into parallel tasks
+MAX_SPLIT_DEPTH = 3
+
+# Upper bound in days (exclusive) and label of each age histogram bucket
+AGE_BUCKETS = [
+    (7, '< 1 week'),
+    (30, '< 1 month'),
+    (182, '< 6 months'),
+    (365, '< 1 year'),
+    (3 * 365, '< 3 years'),
+    (None, '3+ years'),
+]
+
+
+class StatsAccumulator:
+    """
+    Running aggregates for a stream of files.
+
+    Memory only grows with the number of categories, months and top-level
+    folders, plus a bounded heap holding the largest files.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.files = 0
+        self.bytes = 0
+        self.categories = {}  # category -> [files, bytes]
+        self.months = {}  # YYYY-MM -> [files, bytes]
+        self.folders = {}  # top-level folder -> [files, bytes]
+        self.ages = {label: [0, 0] for _, label in AGE_BUCKETS}
+        self.largest = []  # Min-heap of (size, path), at most top_n long
+
+    @staticmethod
+    def _count(totals: Dict[str, List[int]], key: str, files: int, size: int) -> None:
+        entry = totals.setdefault(key, [0, 0])
+        entry[0] += files
+        entry[1] += size
+
+    def add(self, rel_path: str, category: str, size: int, modified: float, now: float) -> None:
+        """
+        Adds one file to the aggregates.
+
+        :param rel_path: Path of the file relative to the scanned folder, using '/' separators
+        :param category: Category of the file
+        :param size: Size in bytes
+        :param modified: Modification timestamp
+        :param now: Timestamp the ages are measured against
+        """
+        self.files += 1
+        self.bytes += size
+        self._count(self.categories, category, 1, size)
+        self._count(self.months, datetime.fromtimestamp(modified).strftime('%Y-%m'), 1, size)
+        self._count(self.folders, rel_path.split('/', 1)[0] if '/' in rel_path else '.', 1, size)
+
+        age_days = (now - modified) / 86400
+        for max_days, label in AGE_BUCKETS:
+            if max_days is None or age_days < max_days:
+                self.ages[label][0] += 1
+                self.ages[label][1] += size
+                break
+
+        if len(self.largest) < self.top_n:
+            heapq.heappush(self.largest, (size, rel_path))
+        elif size > self.largest[0][0]:
+            heapq.heappushpop(self.largest, (size, rel_path))
+
+    def merge(self, other: 'StatsAccumulator') -> None:
+        """Adds the aggregates of another accumulator, e.g. one computed for a subtree."""
+        self.files += other.files
+        self.bytes += other.bytes
+        for mine, theirs in ((self.categories, other.categories), (self.months, other.months),
+                             (self.folders, other.folders), (self.ages, other.ages)):
+            for key, (files, size) in theirs.items():
+                self._count(mine, key, files, size)
+        for entry in other.largest:
+            if len(self.largest) < self.top_n:
+                heapq.heappush(self.largest, entry)
+            elif entry[0] > self.largest[0][0]:
+                heapq.heappushpop(self.largest, entry)
+
+    def to_dict(self) -> dict:
+        """Returns the aggregates as a JSON-serializable dictionary."""
+        def totals(entries, key=None):
+            return {name: {'files': files, 'bytes': size} for name, (files, size) in sorted(entries.items(), key=key)}
+
+        return {
+            'files': self.files,
+            'bytes': self.bytes,
+            'categories': totals(self.categories, key=lambda item: -item[1][1]),
+            'months': totals(self.months),
+            'folders': totals(self.folders, key=lambda item: -item[1][1]),
+            'ages': {label: {'files': self.ages[label][0], 'bytes': self.ages[label][1]} for _, label in AGE_BUCKETS},
+            'largest': [{'path': path, 'bytes': size} for size, path in sorted(self.largest, reverse=True)],
+        }
+
+
+def _collect(folder_path: str, ignore_rules: IgnoreRules, subfolder: str, recursive: bool,
+             include_archived: bool, top_n: int, now: float) -> StatsAccumulator:
+    """Aggregates the files of one subtree. Runs in a worker process."""
+    file_manager = FileManager(folder_path, ignore_rules)
+    accumulator = StatsAccumulator(top_n)
+    for file_path, size, modified in file_manager.iter_file_stats(include_archived, subfolder, recursive):
+        rel_path = os.path.relpath(file_path, folder_path).replace(os.sep, '/')
+        category = file_manager.file_classifier.categorize_by_extension(file_path)
+        accumulator.add(rel_path, category, size, modified, now)
+    return accumulator
+
+
+class FolderStats:
+    def __init__(self, folder_path, ignore_rules: IgnoreRules = None, top_n: int = 10,
+                 max_workers: int = None, include_archived: bool = True):
+        self.folder_path = folder_path
+        self.ignore_rules = ignore_rules or IgnoreRules.from_folder(folder_path)
+        self.top_n = top_n
+        self.max_workers = max_workers
+        self.include_archived = include_archived
+
+    def plan_subtrees(self, subfolders: List[str]) -> List[Tuple[str, bool]]:
+        """
+        Splits the scan into tasks that can run in parallel.
+
+        Each top-level folder starts as one task. While there are fewer tasks than
+        workers, folders are split one level deeper: the files directly inside a
+        folder become one task and each of its subfolders becomes another. This keeps
+        every worker busy when most files live under a single top-level folder.
+
+        :param subfolders: Top-level folders to scan
+        :return: List of (subfolder, recursive) tasks
+        """
+        workers = self.max_workers or os.cpu_count() or 1
+        tasks = [(subfolder, True) for subfolder in subfolders]
+        for _ in range(MAX_SPLIT_DEPTH):
+            if len(tasks) >= workers:
+                break
+            split_tasks = []
+            for subfolder, recursive in tasks:
+                children = []
+                if recursive:
+                    _, children, _ = next(walk_folder(self.folder_path, self.ignore_rules, subfolder), (None, [], None))
+                    # Symlinked folders are never followed by the walk, so they must not become tasks
+                    children = [child for child in children
+                                if not os.path.islink(os.path.join(self.folder_path, subfolder, child))]
+                if children:
+                    split_tasks.append((subfolder, False))
+                    split_tasks.extend((os.path.join(subfolder, child), True) for child in children)
+                else:
+                    split_tasks.append((subfolder, recursive))
+            if len(split_tasks) == len(tasks):
+                break  # Nothing left to split
+            tasks = split_tasks
+        return tasks
+
+    def collect(self) -> dict:
+        """
+        Computes counts and bytes per category, month and top-level folder, the age
+        histogram and the largest files in one streaming pass, without moving anything.
+
+        Subtrees are scanned in worker processes, see plan_subtrees(), and the
+        partial aggregates are merged as they complete.
+
+        :return: Dictionary of aggregates, see StatsAccumulator.to_dict()
+        """
+        if not os.path.isdir(self.folder_path):
+            raise ValueError(f"{self.folder_path} is not a valid directory.")
+
+        now = time.time()
+        _, subfolders, _ = next(walk_folder(self.folder_path, self.ignore_rules))
+        # Symlinked folders are never followed by the walk, so they must not become tasks
+        subfolders = [subfolder for subfolder in subfolders
+                      if not os.path.islink(os.path.join(self.folder_path, subfolder))]
+
+        # Files directly in the folder are cheap enough to aggregate here
+        accumulator = _collect(self.folder_path, self.ignore_rules, None, False,
+                               self.include_archived, self.top_n, now)
+        tasks = self.plan_subtrees(subfolders)
+        if tasks:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(_collect, self.folder_path, self.ignore_rules, subfolder, recursive,
+                                    self.include_archived, self.top_n, now)
+                    for subfolder, recursive in tasks
+                ]
+                for future in as_completed(futures):
+                    accumulator.merge(future.result())
+        return accumulator.to_dict()
@@ -1,11 +1,21 @@
 import os
+import sys
 import shutil
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.archive_index import is_archive_file
+from src.ignore_rules import IgnoreRules, walk_folder
+from src.move_scheduler import MoveScheduler
+from src.utils import fsync_directory
 
 class FolderStructure:
-    def __init__(self, base_folder):
+    def __init__(self, base_folder, ignore_rules: IgnoreRules = None):
         self.base_folder = base_folder
+        self.ignore_rules = ignore_rules or IgnoreRules.from_folder(base_folder)
 
     def create_directory(self, folder_path: str) -> None:
         """Creates a directory if it doesn't exist."""
@@ -47,15 +57,48 @@ class FolderStructure:
 
         return dest_path
 
-    def organize_files(self, sorted_files: Dict[str, Dict[str, List[str]]], start_date=None, end_date=None) -> bool:
+    def move_files(self, moves: List[Tuple[str, str]], durable: bool = False) -> None:
+        """
+        Moves files into their destination folders, grouped by source and destination folder.
+        
+        :param moves: List of (file path, destination folder) tuples
+        :param durable: Flush every touched folder to disk once per batch, so that completed
+            moves survive a crash without paying for an fsync per file
+        """
+        for batch in MoveScheduler.schedule(moves):
+            touched = {batch.source_folder, batch.dest_folder}
+            if durable:
+                # New folders are entries in their parent, which must be flushed too
+                missing = batch.dest_folder
+                while not os.path.isdir(missing):
+                    parent = os.path.dirname(missing) or os.curdir
+                    touched.add(parent)
+                    if parent == missing:
+                        break
+                    missing = parent
+
+            self.create_directory(batch.dest_folder)
+            for file in batch.files:
+                dest_path = os.path.join(batch.dest_folder, os.path.basename(file))
+                dest_path = self.resolve_duplicate_file(dest_path)
+                shutil.move(file, dest_path)
+
+            if durable:
+                for folder in sorted(touched):
+                    fsync_directory(folder)
+
+    def organize_files(self, sorted_files: Dict[str, Dict[str, List[str]]], start_date=None, end_date=None,
+                       durable: bool = False) -> bool:
         """
         Organizes files into folders based on the sorted file dictionary.
         
         :param sorted_files: Dictionary of sorted files with structure {category: {date: [files]}}
         :param start_date: Optional start date for filtering files
         :param end_date: Optional end date for filtering files
+        :param durable: Flush touched folders to disk once per batch of moves
         :return: True if organization is successful
         """
+        moves = []
         for category, dates in sorted_files.items():
             for date, files in dates.items():
                 # Filter by start and end date if provided
@@ -65,32 +108,35 @@ class FolderStructure:
                     continue
 
                 for file in files:
-                    file_folder, file_name = os.path.split(file)
+                    # Bundles stay with their sidecar in the category folder, next to the date folder they replaced
+                    if is_archive_file(file):
+                        continue
+
+                    file_folder = os.path.dirname(file)
                     relative_folder = os.path.relpath(file_folder, self.base_folder)
                     dest_folder = os.path.join(self.base_folder, category, date, relative_folder)
-                    
-                    self.create_directory(dest_folder)
-                    
-                    dest_path = os.path.join(dest_folder, file_name)
-                    dest_path = self.resolve_duplicate_file(dest_path)
-                    
-                    shutil.move(file, dest_path)
+                    moves.append((file, dest_folder))
+
+        self.move_files(moves, durable)
         return True
 
-    def organize_files_by_date(self, start_date: str = None, end_date: str = None) -> bool:
+    def organize_files_by_date(self, start_date: str = None, end_date: str = None, durable: bool = False) -> bool:
         """
         Organizes files into folders by their creation date, optionally filtering by start and end date.
+        Folders and files excluded by the ignore rules are left untouched.
         
         :param start_date: Filter files created after this date (YYYY-MM-DD)
         :param end_date: Filter files created before this date (YYYY-MM-DD)
+        :param durable: Flush touched folders to disk once per batch of moves
         :return: True if organization is successful
         """
-        for root, dirs, files in os.walk(self.base_folder):
+        moves = []
+        for root, dirs, files in walk_folder(self.base_folder, self.ignore_rules):
             for file_name in files:
                 file_path = os.path.join(root, file_name)
 
-                # Skip hidden files
-                if file_name.startswith('.'):
+                # Skip hidden files, and bundles which stay next to their sidecar
+                if file_name.startswith('.') or is_archive_file(file_path):
                     continue
 
                 if os.path.isfile(file_path):
@@ -105,13 +151,9 @@ class FolderStructure:
                     # Preserve relative folder structure in the target directory
                     relative_folder = os.path.relpath(root, self.base_folder)
                     date_folder = os.path.join(self.base_folder, creation_date, relative_folder)
-                    self.create_directory(date_folder)
-                    
-                    dest_path = os.path.join(date_folder, file_name)
-                    dest_path = self.resolve_duplicate_file(dest_path)
-                    
-                    shutil.move(file_path, dest_path)
+                    moves.append((file_path, date_folder))
 
+        self.move_files(moves, durable)
         return True
 
     def remove_empty_folders(self) -> None:
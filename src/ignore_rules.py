@@ -0,0 +1,253 @@
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+IGNORE_FILE = '.organizerignore'
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Translates a gitignore-style glob into a regular expression over '/'-separated paths.
+
+    '*' and '?' never cross a '/', while '**' matches across any number of folders.
+    A backslash escapes the next character, so '\\*' matches a literal '*'.
+    """
+    i, n = 0, len(pattern)
+    regex = ''
+    while i < n:
+        char = pattern[i]
+        if char == '\\':
+            # A trailing backslash has nothing to escape and is kept as is
+            regex += re.escape(pattern[i + 1] if i + 1 < n else char)
+            i += 2
+        elif pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif char == '*':
+            regex += '[^/]*'
+            i += 1
+        elif char == '?':
+            regex += '[^/]'
+            i += 1
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex += re.escape(char)
+                i += 1
+                continue
+            char_class = pattern[i + 1:end]
+            if char_class.startswith('!'):
+                char_class = '^' + char_class[1:]
+            regex += '[' + char_class.replace('\\', '\\\\') + ']'
+            i = end + 1
+        else:
+            regex += re.escape(char)
+            i += 1
+    return regex
+
+
+def is_literal(pattern: str) -> bool:
+    """Returns True if the pattern has no glob characters."""
+    return not any(char in pattern for char in '*?[\\')
+
+
+class IgnoreRules:
+    """
+    Gitignore-style exclude rules, compiled once and matched against relative paths.
+
+    Literal patterns such as 'node_modules' or '/build/cache' are stored in a
+    prefix trie of path components, and all glob patterns are merged into a
+    single regular expression. As in gitignore, patterns starting with '!'
+    re-include entries, the last matching pattern wins, and nothing inside an
+    excluded folder can be re-included. Include globs, when given, restrict
+    which files are kept but never prune folders.
+    """
+
+    def __init__(self, patterns: List[str] = None, includes: List[str] = None):
+        self.trie = {}  # component -> (children, {'any'|'dir': pattern position})
+        self.floating_names = {}  # folder or file name matching at any depth -> {'any'|'dir': pattern position}
+        regexes = []  # (pattern position, negate, regex)
+
+        for position, pattern in enumerate([IGNORE_FILE] + list(patterns or [])):
+            pattern = pattern.strip()
+            # As in gitignore, '\#' and '\!' start patterns for names beginning with '#' or '!'
+            escaped = pattern.startswith(('\\#', '\\!'))
+            if escaped:
+                pattern = pattern[1:]
+            elif not pattern or pattern.startswith('#'):
+                continue
+            negate = not escaped and pattern.startswith('!')
+            if negate:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            anchored = '/' in pattern
+            pattern = pattern.lstrip('/')
+            if not pattern:
+                continue
+            rule = 'dir' if dir_only else 'any'
+
+            if not negate and is_literal(pattern):
+                if anchored:
+                    self._trie_rules(pattern.split('/'))[rule] = position
+                else:
+                    self.floating_names.setdefault(pattern, {})[rule] = position
+                continue
+
+            regex = glob_to_regex(pattern)
+            if not anchored:
+                regex = '(?:.*/)?' + regex
+            regex += '/' if dir_only else '/?'
+            regexes.append((position, negate, regex))
+
+        # Later patterns come first, so the alternative that matches is the last matching pattern
+        regexes.reverse()
+        self.regex_patterns = [(position, negate) for position, negate, _ in regexes]
+        self.regex = self._compile(['(' + regex + ')' for _, _, regex in regexes])
+        self.include_regex = self._compile([
+            ('' if '/' in include else '(?:.*/)?') + glob_to_regex(include.lstrip('/'))
+            for include in includes or []
+        ])
+
+    @classmethod
+    def from_folder(cls, folder_path: str, includes: List[str] = None, excludes: List[str] = None) -> 'IgnoreRules':
+        """
+        Builds the rules for a folder from its .organizerignore file and extra exclude globs.
+        Exclude globs are applied after the file, so they win over its '!' patterns.
+
+        :param folder_path: Folder whose .organizerignore file should be read, if present
+        :param includes: Optional globs that kept files must match
+        :param excludes: Optional extra exclude globs, e.g. from the command line
+        :return: Compiled rules
+        """
+        patterns = []
+        ignore_file = os.path.join(folder_path, IGNORE_FILE)
+        if os.path.isfile(ignore_file):
+            with open(ignore_file, 'r') as file:
+                patterns.extend(file.read().splitlines())
+        patterns.extend(excludes or [])
+        return cls(patterns, includes)
+
+    @staticmethod
+    def _compile(regexes: List[str]) -> Optional[re.Pattern]:
+        return re.compile('(?:' + '|'.join(regexes) + ')$') if regexes else None
+
+    def _trie_rules(self, components: List[str]) -> Dict[str, int]:
+        """Returns the rules stored for a path in the trie, creating its nodes as needed."""
+        node = self.trie
+        for component in components[:-1]:
+            node = node.setdefault(component, ({}, {}))[0]
+        return node.setdefault(components[-1], ({}, {}))[1]
+
+    def _trie_lookup(self, components: List[str]) -> Dict[str, int]:
+        """Returns the rules stored for exactly this path in the trie, if any."""
+        node, rules = self.trie, {}
+        for component in components:
+            if component not in node:
+                return {}
+            node, rules = node[component]
+        return rules
+
+    def matches(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Checks a single entry against the rules, assuming its parent folders are not excluded.
+
+        :param rel_path: Path relative to the scanned folder, using '/' separators
+        :param is_dir: Whether the entry is a folder
+        :return: True if the entry is excluded
+        """
+        last_position, excluded = -1, False
+        literal_rules = [self.floating_names.get(rel_path.rsplit('/', 1)[-1], {})]
+        if self.trie:
+            literal_rules.append(self._trie_lookup(rel_path.split('/')))
+        for rules in literal_rules:
+            for rule, position in rules.items():
+                if (rule == 'any' or is_dir) and position > last_position:
+                    last_position, excluded = position, True
+
+        if self.regex is not None:
+            match = self.regex.match(rel_path + ('/' if is_dir else ''))
+            if match is not None:
+                position, negate = self.regex_patterns[match.lastindex - 1]
+                if position > last_position:
+                    excluded = not negate
+        return excluded
+
+    def is_excluded(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Checks an entry and all of its parent folders against the rules.
+
+        :param rel_path: Path relative to the scanned folder, using '/' separators
+        :param is_dir: Whether the entry is a folder
+        :return: True if the entry or one of its parent folders is excluded
+        """
+        components = rel_path.split('/')
+        for depth in range(1, len(components)):
+            if self.matches('/'.join(components[:depth]), is_dir=True):
+                return True
+        return self.matches(rel_path, is_dir)
+
+    def is_included(self, rel_path: str) -> bool:
+        """Returns True if a file passes the include globs (always True without includes)."""
+        return self.include_regex is None or self.include_regex.match(rel_path) is not None
+
+
+def walk_folder_entries(folder_path: str, ignore_rules: IgnoreRules,
+                        subfolder: str = None) -> Iterator[Tuple[str, List[str], List[os.DirEntry]]]:
+    """
+    Walks a folder top-down like os.walk, pruning excluded folders before they are opened.
+
+    Files are returned as os.DirEntry objects, so their type and stat results
+    come from the directory listing instead of extra system calls where possible.
+    Folders that cannot be listed are skipped, as os.walk does.
+
+    :param folder_path: Folder the ignore rules are relative to
+    :param ignore_rules: Rules deciding which folders and files to skip
+    :param subfolder: Optional folder inside folder_path to walk instead of the whole folder
+    :return: Iterator of (root, dirs, file entries); removing names from dirs prunes them
+    """
+    start = os.path.join(folder_path, subfolder) if subfolder else folder_path
+    stack = [start]
+    while stack:
+        root = stack.pop()
+        rel_root = os.path.relpath(root, folder_path).replace(os.sep, '/')
+        prefix = '' if rel_root == '.' else rel_root + '/'
+        dirs, files, links = [], [], set()
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if ignore_rules.matches(prefix + entry.name, is_dir=True):
+                            continue
+                        dirs.append(entry.name)
+                        if entry.is_symlink():
+                            links.add(entry.name)  # Listed but not followed, as os.walk does
+                    elif not ignore_rules.matches(prefix + entry.name) and ignore_rules.is_included(prefix + entry.name):
+                        files.append(entry)
+        except OSError:
+            continue
+
+        yield root, dirs, files
+        stack.extend(os.path.join(root, name) for name in reversed(dirs) if name not in links)
+
+
+def walk_folder(folder_path: str, ignore_rules: IgnoreRules,
+                subfolder: str = None) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """
+    Walks a folder like os.walk, pruning excluded folders before they are opened.
+
+    :param folder_path: Folder the ignore rules are relative to
+    :param ignore_rules: Rules deciding which folders and files to skip
+    :param subfolder: Optional folder inside folder_path to walk instead of the whole folder
+    :return: Iterator of (root, dirs, files) with excluded entries removed
+    """
+    for root, dirs, entries in walk_folder_entries(folder_path, ignore_rules, subfolder):
+        yield root, dirs, [entry.name for entry in entries]
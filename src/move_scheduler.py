@@ -0,0 +1,41 @@
+import os
+from itertools import groupby
+from typing import List, NamedTuple, Tuple
+
+
+class MoveBatch(NamedTuple):
+    """Files that move from one source folder into one destination folder."""
+    source_folder: str
+    dest_folder: str
+    files: List[str]
+
+
+class MoveScheduler:
+    """
+    Orders planned moves so that renames touching the same pair of folders run back to back.
+
+    Moving files in category/date order makes consecutive renames jump between
+    unrelated folders, which thrashes the directory-entry cache and the journal.
+    Grouping by (source folder, destination folder) keeps each folder hot while
+    it is being changed and gives a natural point to flush it to disk.
+    """
+
+    @staticmethod
+    def schedule(moves: List[Tuple[str, str]]) -> List[MoveBatch]:
+        """
+        Groups planned moves into batches, one per (source folder, destination folder) pair.
+
+        Files keep their planned order within a batch.
+
+        :param moves: List of (file path, destination folder) tuples
+        :return: List of batches sorted by source folder, then destination folder
+        """
+        keyed = sorted(
+            ((os.path.dirname(os.path.normpath(file_path)) or os.curdir, os.path.normpath(dest_folder), file_path)
+             for file_path, dest_folder in moves),
+            key=lambda move: (move[0], move[1]),
+        )
+        return [
+            MoveBatch(source_folder, dest_folder, [move[2] for move in group])
+            for (source_folder, dest_folder), group in groupby(keyed, key=lambda move: (move[0], move[1]))
+        ]
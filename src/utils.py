@@ -41,6 +41,24 @@ def get_file_size(file_path):
     except Exception as e:
         raise IOError(f"Unable to retrieve the file size: {e}")
 
+def fsync_file(file_path):
+    """Flushes a file's contents to disk."""
+    with open(file_path, 'rb') as file:
+        os.fsync(file.fileno())
+
+def fsync_directory(folder_path):
+    """
+    Flushes a directory's entries to disk so that renames into or out of it survive a crash.
+    Does nothing on platforms that cannot open directories, such as Windows.
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(folder_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 def is_valid_file_type(file_name, allowed_extensions):
     """
     Checks if the file extension is in the list of allowed extensions.
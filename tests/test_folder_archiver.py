@@ -0,0 +1,236 @@
+import unittest
+import os
+import shutil
+import sys
+import tarfile
+import zipfile
+from unittest import mock
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.folder_archiver import FolderArchiver, read_index, zstandard, _verify_bundle
+from src.file_manager import FileManager
+from src.file_classifier import FileClassifier
+from src.file_sorter import FileSorter
+from src.folder_structure import FolderStructure
+
+class TestFolderArchiver(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an organized folder with one old and one recent date bucket."""
+        self.test_folder = "data/sample_archive"
+        self.old_bucket = os.path.join(self.test_folder, "images", "2020-01-01")
+        self.new_bucket = os.path.join(self.test_folder, "images", "2999-01-01")
+        os.makedirs(os.path.join(self.old_bucket, "holiday"), exist_ok=True)
+        os.makedirs(self.new_bucket, exist_ok=True)
+
+        self.sample_files = {
+            os.path.join(self.old_bucket, "image1.jpg"): "This is a sample image file",
+            os.path.join(self.old_bucket, "holiday", "image2.png"): "Another sample image file",
+            os.path.join(self.new_bucket, "image3.jpg"): "A recent image file",
+        }
+
+        for file_path, content in self.sample_files.items():
+            with open(file_path, 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        """Remove the test folder and its contents after tests."""
+        shutil.rmtree(self.test_folder)
+
+    def test_find_cold_buckets(self):
+        """Test that only buckets older than the threshold are selected."""
+        archiver = FolderArchiver(self.test_folder)
+        self.assertEqual(archiver.find_cold_buckets(30), [self.old_bucket])
+
+    def test_archive_cold_buckets_tar_gz(self):
+        """Test that a cold bucket is packed, indexed and removed."""
+        archiver = FolderArchiver(self.test_folder, 'tar.gz', max_workers=2)
+        bundles = archiver.archive_cold_buckets(30)
+
+        bundle_path = self.old_bucket + ".tar.gz"
+        self.assertEqual(bundles, [bundle_path])
+        self.assertFalse(os.path.exists(self.old_bucket))
+        self.assertTrue(os.path.exists(self.new_bucket))
+
+        with tarfile.open(bundle_path) as tar:
+            self.assertEqual(sorted(tar.getnames()), ["holiday/image2.png", "image1.jpg"])
+
+        index = read_index(bundle_path)
+        self.assertEqual(index['format'], 'tar.gz')
+        self.assertEqual(sorted(member['name'] for member in index['members']), ["holiday/image2.png", "image1.jpg"])
+
+    def test_archive_cold_buckets_zip(self):
+        """Test that zip bundles hold every member of the bucket."""
+        archiver = FolderArchiver(self.test_folder, 'zip')
+        bundle_path = archiver.archive_cold_buckets(30)[0]
+
+        with zipfile.ZipFile(bundle_path) as bundle:
+            self.assertEqual(bundle.read("image1.jpg").decode(), "This is a sample image file")
+
+    @unittest.skipUnless(zstandard, "tar.zst bundles require the zstandard package")
+    def test_archive_cold_buckets_tar_zst(self):
+        """Test that tar.zst bundles round-trip every member of the bucket."""
+        bundle_path = FolderArchiver(self.test_folder, 'tar.zst').archive_cold_buckets(30)[0]
+        self.assertEqual(bundle_path, self.old_bucket + ".tar.zst")
+
+        index = read_index(bundle_path)
+        self.assertEqual(index['format'], 'tar.zst')
+        _verify_bundle(bundle_path, index['members'], 'tar.zst')
+
+        with open(bundle_path, 'rb') as fh:
+            with tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(fh), mode='r|') as tar:
+                contents = {info.name: tar.extractfile(info).read().decode() for info in tar}
+        self.assertEqual(contents, {
+            "image1.jpg": "This is a sample image file",
+            "holiday/image2.png": "Another sample image file",
+        })
+
+    def test_invalid_format(self):
+        """Test that unknown archive formats are rejected."""
+        with self.assertRaises(ValueError):
+            FolderArchiver(self.test_folder, 'rar')
+
+    def test_scan_includes_archived_members(self):
+        """Test that scans list archive members and read their metadata from the index."""
+        FolderArchiver(self.test_folder).archive_cold_buckets(30)
+        file_manager = FileManager(self.test_folder)
+
+        files = file_manager.scan_folder(include_archived=True)
+        member_path = os.path.join(self.old_bucket + ".tar.gz", "holiday", "image2.png")
+        self.assertIn(member_path, files)
+        self.assertIn(os.path.join(self.new_bucket, "image3.jpg"), files)
+        self.assertEqual(len(files), 3)
+
+        metadata = file_manager.get_file_metadata(os.path.relpath(member_path, self.test_folder))
+        self.assertEqual(metadata['size'], len("Another sample image file"))
+        self.assertEqual(metadata['archive'], self.old_bucket + ".tar.gz")
+
+    def test_ignored_entries_are_kept(self):
+        """Test that ignored files inside a cold bucket are neither archived nor removed."""
+        for file_name in (".git/config", "node_modules/x.js"):
+            file_path = os.path.join(self.old_bucket, file_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write("must not be touched")
+        with open(os.path.join(self.test_folder, ".organizerignore"), 'w') as f:
+            f.write("node_modules/\n.git/\n")
+
+        bundle_path = FolderArchiver(self.test_folder).archive_cold_buckets(30)[0]
+
+        names = [member['name'] for member in read_index(bundle_path)['members']]
+        self.assertEqual(sorted(names), ["holiday/image2.png", "image1.jpg"])
+        self.assertTrue(os.path.isfile(os.path.join(self.old_bucket, ".git", "config")))
+        self.assertTrue(os.path.isfile(os.path.join(self.old_bucket, "node_modules", "x.js")))
+        self.assertFalse(os.path.exists(os.path.join(self.old_bucket, "image1.jpg")))
+        self.assertFalse(os.path.exists(os.path.join(self.old_bucket, "holiday")))
+
+    def test_organize_keeps_bundles_with_their_index(self):
+        """Test that organizing a tree never separates a bundle from its index sidecar."""
+        test_folder = os.path.abspath(self.test_folder)
+        bundle_path = FolderArchiver(test_folder).archive_cold_buckets(30)[0]
+
+        files = FileManager(test_folder).scan_folder()
+        self.assertIn(bundle_path, files)
+        self.assertNotIn(bundle_path + ".index.json", files)
+
+        sorted_files = FileSorter().sort_files(FileClassifier().classify_files(files), test_folder)
+        folder_structure = FolderStructure(test_folder)
+        folder_structure.organize_files(sorted_files)
+        folder_structure.organize_files_by_date()
+
+        self.assertTrue(os.path.isfile(bundle_path))
+        self.assertTrue(os.path.isfile(bundle_path + ".index.json"))
+        members = FileManager(test_folder).scan_folder(include_archived=True)
+        self.assertIn(os.path.join(bundle_path, "image1.jpg"), members)
+
+    def test_originals_removed_after_flush(self):
+        """Test that the bundle and its index are published and flushed before any original is removed."""
+        bundle_path = self.old_bucket + ".tar.gz"
+
+        def check_published(folder_path):
+            self.assertTrue(os.path.isfile(bundle_path))
+            self.assertTrue(os.path.isfile(bundle_path + ".index.json"))
+            self.assertTrue(os.path.isfile(os.path.join(self.old_bucket, "image1.jpg")))
+
+        with mock.patch("src.folder_archiver.fsync_directory", side_effect=check_published) as fsync_directory:
+            FolderArchiver(self.test_folder).archive_cold_buckets(30)
+        fsync_directory.assert_called_once_with(os.path.dirname(bundle_path))
+        self.assertFalse(os.path.exists(os.path.join(self.old_bucket, "image1.jpg")))
+
+    def test_leftovers_of_interrupted_run_are_replaced(self):
+        """Test that an unpublished sidecar or partial bundle from a crash does not get in the way."""
+        bundle_path = self.old_bucket + ".tar.gz"
+        for leftover in (bundle_path + ".partial", bundle_path + ".index.json"):
+            with open(leftover, 'w') as f:
+                f.write("left over from an interrupted run")
+
+        self.assertEqual(FolderArchiver(self.test_folder).archive_cold_buckets(30), [bundle_path])
+        self.assertFalse(os.path.exists(bundle_path + ".partial"))
+        self.assertEqual(len(read_index(bundle_path)['members']), 2)
+
+    def test_symlinked_bucket_is_skipped(self):
+        """Test that a bucket symlinked to a folder outside the tree is neither archived nor removed."""
+        outside_folder = "data/sample_archive_outside"
+        os.makedirs(outside_folder, exist_ok=True)
+        self.addCleanup(shutil.rmtree, outside_folder)
+        with open(os.path.join(outside_folder, "keep.txt"), 'w') as f:
+            f.write("outside the tree")
+        linked_bucket = os.path.join(self.test_folder, "images", "2020-02-02")
+        os.symlink(os.path.abspath(outside_folder), linked_bucket)
+
+        archiver = FolderArchiver(self.test_folder)
+        self.assertEqual(archiver.find_cold_buckets(30), [self.old_bucket])
+        self.assertEqual(archiver.archive_cold_buckets(30), [self.old_bucket + ".tar.gz"])
+
+        self.assertTrue(os.path.isfile(os.path.join(outside_folder, "keep.txt")))
+        self.assertTrue(os.path.islink(linked_bucket))
+        self.assertFalse(os.path.exists(linked_bucket + ".tar.gz"))
+
+    def test_failing_bucket_does_not_stop_others(self):
+        """Test that an error while publishing one bucket is reported after the others are archived."""
+        second_bucket = os.path.join(self.test_folder, "images", "2020-01-02")
+        os.makedirs(second_bucket)
+        with open(os.path.join(second_bucket, "image4.jpg"), 'w') as f:
+            f.write("Another old image file")
+
+        archiver = FolderArchiver(self.test_folder)
+        publish_bundle = archiver.publish_bundle
+
+        def fail_first_bucket(bundle_path, index):
+            if bundle_path.startswith(self.old_bucket):
+                raise OSError("disk full")
+            publish_bundle(bundle_path, index)
+
+        with mock.patch.object(archiver, "publish_bundle", side_effect=fail_first_bucket):
+            with self.assertRaises(IOError) as context:
+                archiver.archive_cold_buckets(30)
+
+        self.assertIn(self.old_bucket, str(context.exception))
+        self.assertTrue(os.path.isfile(second_bucket + ".tar.gz"))
+        self.assertFalse(os.path.exists(second_bucket))
+        self.assertTrue(os.path.isfile(os.path.join(self.old_bucket, "image1.jpg")))
+
+    def test_symlinked_files_are_skipped(self):
+        """Test that symlinks inside a bucket are left alone by every format, even dangling ones."""
+        for archive_format in ('tar.gz', 'zip'):
+            with self.subTest(archive_format=archive_format):
+                bucket = os.path.join(self.test_folder, "documents", "2020-03-03")
+                os.makedirs(bucket)
+                with open(os.path.join(bucket, "doc1.pdf"), 'w') as f:
+                    f.write("Sample document file")
+                os.symlink("doc1.pdf", os.path.join(bucket, "link.pdf"))
+                os.symlink("missing.pdf", os.path.join(bucket, "dangling.pdf"))
+
+                bundle_path = bucket + "." + archive_format
+                self.assertIn(bundle_path, FolderArchiver(self.test_folder, archive_format).archive_cold_buckets(30))
+
+                self.assertEqual([member['name'] for member in read_index(bundle_path)['members']], ["doc1.pdf"])
+                self.assertTrue(os.path.islink(os.path.join(bucket, "link.pdf")))
+                self.assertTrue(os.path.islink(os.path.join(bucket, "dangling.pdf")))
+                self.assertFalse(os.path.exists(os.path.join(bucket, "doc1.pdf")))
+                shutil.rmtree(bucket)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import os
+import shutil
+import sys
+import time
+from unittest import mock
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.folder_stats import FolderStats, StatsAccumulator
+from src.file_manager import FileManager
+from src.ignore_rules import walk_folder_entries
+
+class TestFolderStats(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a folder with files of known sizes and ages."""
+        self.test_folder = "data/sample_stats"
+        now = time.time()
+        self.sample_files = {
+            "doc1.pdf": (10, now),
+            "photos/image1.jpg": (300, now - 2 * 86400),
+            "photos/2019/image2.png": (200, now - 400 * 86400),
+            "music/audio1.mp3": (500, now - 40 * 86400),
+            "node_modules/lib/index.js": (9999, now),
+        }
+
+        for file_name, (size, modified) in self.sample_files.items():
+            file_path = os.path.join(self.test_folder, file_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write("x" * size)
+            os.utime(file_path, (modified, modified))
+
+        with open(os.path.join(self.test_folder, ".organizerignore"), 'w') as f:
+            f.write("node_modules/\n")
+
+    def tearDown(self):
+        """Remove the test folder and its contents after tests."""
+        shutil.rmtree(self.test_folder)
+
+    def test_collect(self):
+        """Test that all aggregates are computed and ignored folders are skipped."""
+        stats = FolderStats(self.test_folder, top_n=2, max_workers=2).collect()
+
+        self.assertEqual(stats['files'], 4)
+        self.assertEqual(stats['bytes'], 1010)
+        self.assertEqual(stats['categories']['images'], {'files': 2, 'bytes': 500})
+        self.assertEqual(stats['categories']['audio'], {'files': 1, 'bytes': 500})
+        self.assertEqual(stats['folders'], {
+            'photos': {'files': 2, 'bytes': 500},
+            'music': {'files': 1, 'bytes': 500},
+            '.': {'files': 1, 'bytes': 10},
+        })
+        self.assertEqual(sum(month['files'] for month in stats['months'].values()), 4)
+        self.assertEqual(stats['ages']['< 1 week'], {'files': 2, 'bytes': 310})
+        self.assertEqual(stats['ages']['< 6 months'], {'files': 1, 'bytes': 500})
+        self.assertEqual(stats['ages']['< 3 years'], {'files': 1, 'bytes': 200})
+        self.assertEqual(stats['largest'], [
+            {'path': 'music/audio1.mp3', 'bytes': 500},
+            {'path': 'photos/image1.jpg', 'bytes': 300},
+        ])
+
+    def test_single_top_level_folder_is_split(self):
+        """Test that a lone top-level folder is split into subtasks and still counted once."""
+        for year in ("2021", "2022", "2023"):
+            os.makedirs(os.path.join(self.test_folder, "photos", year), exist_ok=True)
+            with open(os.path.join(self.test_folder, "photos", year, "image.jpg"), 'w') as f:
+                f.write("x" * 100)
+
+        folder_stats = FolderStats(self.test_folder, max_workers=4)
+        tasks = folder_stats.plan_subtrees(["photos"])
+        self.assertIn(("photos", False), tasks)
+        self.assertIn((os.path.join("photos", "2021"), True), tasks)
+
+        stats = folder_stats.collect()
+        self.assertEqual(stats['folders']['photos'], {'files': 5, 'bytes': 800})
+
+    def test_symlinked_folder_is_not_followed(self):
+        """Test that a top-level symlink to a folder outside the tree is not scanned."""
+        outside_folder = "data/sample_stats_outside"
+        os.makedirs(outside_folder, exist_ok=True)
+        self.addCleanup(shutil.rmtree, outside_folder)
+        with open(os.path.join(outside_folder, "secret.pdf"), 'w') as f:
+            f.write("x" * 1000)
+        os.symlink(os.path.abspath(outside_folder), os.path.join(self.test_folder, "linked"))
+
+        stats = FolderStats(self.test_folder, max_workers=2).collect()
+
+        self.assertNotIn('linked', stats['folders'])
+        self.assertEqual(stats['files'], 4)
+
+    def test_collect_does_not_modify_folder(self):
+        """Test that collecting statistics leaves every file in place."""
+        FolderStats(self.test_folder).collect()
+        for file_name in self.sample_files:
+            self.assertTrue(os.path.isfile(os.path.join(self.test_folder, file_name)))
+
+    def test_unreadable_files_are_skipped(self):
+        """Test that a file whose stat fails does not abort the scan."""
+        class UnreadableEntry:
+            path = os.path.join(self.test_folder, "locked.pdf")
+
+            def stat(self):
+                raise PermissionError(13, "Permission denied", self.path)
+
+        def walk_with_unreadable_file(*args):
+            for root, dirs, entries in walk_folder_entries(*args):
+                yield root, dirs, entries + [UnreadableEntry()]
+
+        with mock.patch("src.file_manager.walk_folder_entries", side_effect=walk_with_unreadable_file):
+            files = list(FileManager(self.test_folder).iter_file_stats())
+
+        self.assertEqual(len(files), 4)
+        self.assertNotIn(UnreadableEntry.path, [file_path for file_path, _, _ in files])
+
+    def test_largest_heap_is_bounded(self):
+        """Test that the accumulator keeps only the top N files, also across merges."""
+        first, second = StatsAccumulator(top_n=3), StatsAccumulator(top_n=3)
+        now = time.time()
+        for size in range(10):
+            first.add(f"a/{size}.txt", 'documents', size, now, now)
+            second.add(f"b/{size}.txt", 'documents', size + 100, now, now)
+        first.merge(second)
+
+        self.assertEqual(len(first.largest), 3)
+        self.assertEqual([entry['bytes'] for entry in first.to_dict()['largest']], [109, 108, 107])
+        self.assertEqual(first.files, 20)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import os
+import shutil
+import sys
+from unittest import mock
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ignore_rules import IgnoreRules, walk_folder
+from src.file_manager import FileManager
+
+class TestIgnoreRules(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a folder with subtrees that should be ignored."""
+        self.test_folder = "data/sample_ignore"
+        self.sample_files = [
+            "doc1.pdf",
+            "notes.tmp",
+            ".git/config",
+            "project/node_modules/lib/index.js",
+            "project/src/app.py",
+            "build/cache/blob.bin",
+            "build/output.zip",
+            "logs/app.log",
+            "logs/keep.log",
+        ]
+
+        for file_name in self.sample_files:
+            file_path = os.path.join(self.test_folder, file_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write("sample content")
+
+        with open(os.path.join(self.test_folder, ".organizerignore"), 'w') as f:
+            f.write("# Version control and dependencies\n.git/\nnode_modules\n\n/build/cache\n*.tmp\nlogs/*.log\n!logs/keep.log\n")
+
+    def tearDown(self):
+        """Remove the test folder and its contents after tests."""
+        shutil.rmtree(self.test_folder)
+
+    def scanned(self, file_manager):
+        return sorted(os.path.relpath(path, self.test_folder).replace(os.sep, '/') for path in file_manager.scan_folder())
+
+    def test_literal_and_glob_patterns(self):
+        """Test that literal, anchored, glob and negated patterns are matched correctly."""
+        rules = IgnoreRules([".git/", "node_modules", "/build/cache", "*.tmp", "logs/*.log", "!logs/keep.log", "**/secret"])
+        self.assertTrue(rules.is_excluded(".git", is_dir=True))
+        self.assertFalse(rules.is_excluded(".git"))  # Folder-only pattern
+        self.assertTrue(rules.is_excluded("a/b/node_modules/x.js"))
+        self.assertTrue(rules.is_excluded("build/cache/blob.bin"))
+        self.assertFalse(rules.is_excluded("other/build/cache/blob.bin"))  # Anchored pattern
+        self.assertTrue(rules.is_excluded("deep/notes.tmp"))
+        self.assertTrue(rules.is_excluded("logs/app.log"))
+        self.assertFalse(rules.is_excluded("logs/keep.log"))
+        self.assertTrue(rules.is_excluded("a/b/secret", is_dir=True))
+        self.assertFalse(rules.is_excluded("doc1.pdf"))
+
+    def test_last_matching_pattern_wins(self):
+        """Test that patterns apply in order, as in gitignore."""
+        self.assertTrue(IgnoreRules(["!keep.log", "*.log"]).is_excluded("keep.log"))
+        self.assertFalse(IgnoreRules(["*.log", "!keep.log"]).is_excluded("keep.log"))
+        self.assertTrue(IgnoreRules(["*.log", "!keep.log", "keep.log"]).is_excluded("keep.log"))
+        self.assertFalse(IgnoreRules(["cache/", "!cache/"]).is_excluded("cache", is_dir=True))
+        # Nothing inside an excluded folder can be re-included
+        self.assertTrue(IgnoreRules(["build/", "!build/keep.txt"]).is_excluded("build/keep.txt"))
+
+    def test_backslash_escapes(self):
+        """Test that a backslash matches the next character literally, as in gitignore."""
+        self.assertTrue(IgnoreRules([r"\#notes"]).is_excluded("#notes"))
+        self.assertTrue(IgnoreRules([r"\!important"]).is_excluded("!important"))
+        self.assertTrue(IgnoreRules([r"\!important", "*.log"]).is_excluded("!important"))
+        self.assertTrue(IgnoreRules([r"what\?.txt"]).is_excluded("what?.txt"))
+        self.assertFalse(IgnoreRules([r"what\?.txt"]).is_excluded("whatX.txt"))
+        self.assertTrue(IgnoreRules([r"\*.txt"]).is_excluded("*.txt"))
+        self.assertFalse(IgnoreRules([r"\*.txt"]).is_excluded("a.txt"))
+        # Without the backslash, '#' still starts a comment
+        self.assertFalse(IgnoreRules(["#notes"]).is_excluded("#notes"))
+
+    def test_scan_folder_uses_ignore_file(self):
+        """Test that scan_folder honors .organizerignore and never lists the ignore file itself."""
+        self.assertEqual(self.scanned(FileManager(self.test_folder)),
+                         ["build/output.zip", "doc1.pdf", "logs/keep.log", "project/src/app.py"])
+
+    def test_include_and_exclude_globs(self):
+        """Test that command-line globs are combined with the ignore file."""
+        rules = IgnoreRules.from_folder(self.test_folder, includes=["*.py", "*.pdf"], excludes=["project/"])
+        self.assertEqual(self.scanned(FileManager(self.test_folder, rules)), ["doc1.pdf"])
+
+    def test_excluded_folders_are_pruned(self):
+        """Test that excluded folders are never opened during the walk."""
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            list(walk_folder(self.test_folder, IgnoreRules.from_folder(self.test_folder)))
+        opened = [os.path.relpath(call.args[0], self.test_folder) for call in scandir.call_args_list]
+        self.assertNotIn(".git", opened)
+        self.assertNotIn(os.path.join("project", "node_modules"), opened)
+        self.assertNotIn(os.path.join("build", "cache"), opened)
+        self.assertIn(os.path.join("project", "src"), opened)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import shutil
+import sys
+from unittest import mock
+
+# Add the parent directory of 'src' to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.move_scheduler import MoveScheduler
+from src.folder_structure import FolderStructure
+
+class TestMoveScheduler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a folder with files in two source folders."""
+        self.test_folder = "data/sample_moves"
+        self.sample_files = ["a/image1.jpg", "b/doc1.pdf", "a/doc2.pdf", "b/image2.png", "a/image3.jpg"]
+
+        for file_name in self.sample_files:
+            file_path = os.path.join(self.test_folder, file_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write("sample content")
+
+        self.sorted_files = {
+            "images": {"2024-01-01": [os.path.join(self.test_folder, name) for name in ("a/image1.jpg", "b/image2.png", "a/image3.jpg")]},
+            "documents": {"2024-01-01": [os.path.join(self.test_folder, name) for name in ("b/doc1.pdf", "a/doc2.pdf")]},
+        }
+
+    def tearDown(self):
+        """Remove the test folder and its contents after tests."""
+        shutil.rmtree(self.test_folder)
+
+    def test_schedule_groups_by_folder_pair(self):
+        """Test that moves are grouped and ordered by source and destination folder."""
+        moves = [
+            ("src/a/1.jpg", "dest/images"),
+            ("src/b/2.pdf", "dest/documents"),
+            ("src/a/3.pdf", "dest/documents"),
+            ("src/a/4.jpg", "dest/images/."),
+        ]
+        batches = MoveScheduler.schedule(moves)
+        self.assertEqual([(batch.source_folder, batch.dest_folder, batch.files) for batch in batches], [
+            ("src/a", "dest/documents", ["src/a/3.pdf"]),
+            ("src/a", "dest/images", ["src/a/1.jpg", "src/a/4.jpg"]),
+            ("src/b", "dest/documents", ["src/b/2.pdf"]),
+        ])
+
+    def test_organize_files_moves_every_file(self):
+        """Test that scheduled moves land every file in its category and date folder."""
+        FolderStructure(self.test_folder).organize_files(self.sorted_files)
+        for category, name in [("images", "a/image1.jpg"), ("images", "b/image2.png"), ("documents", "a/doc2.pdf")]:
+            self.assertTrue(os.path.isfile(os.path.join(self.test_folder, category, "2024-01-01", name)))
+        self.assertFalse(os.path.exists(os.path.join(self.test_folder, "a", "image1.jpg")))
+
+    def test_durable_fsyncs_once_per_batch(self):
+        """Test that durable mode flushes each touched folder once per batch instead of once per file."""
+        with mock.patch("src.folder_structure.fsync_directory") as fsync_directory:
+            FolderStructure(self.test_folder).organize_files(self.sorted_files, durable=True)
+
+        flushed = [os.path.relpath(call.args[0], self.test_folder) for call in fsync_directory.call_args_list]
+        # Four batches: (a, images), (a, documents), (b, images), (b, documents)
+        self.assertEqual(flushed.count("a"), 2)
+        self.assertEqual(flushed.count("b"), 2)
+        self.assertEqual(flushed.count(os.path.join("images", "2024-01-01", "a")), 1)
+        # The new category folders are entries of the base folder, which is flushed when they are created
+        self.assertIn(".", flushed)
+
+    def test_not_durable_never_fsyncs(self):
+        """Test that folders are not flushed unless durable mode is requested."""
+        with mock.patch("src.folder_structure.fsync_directory") as fsync_directory:
+            FolderStructure(self.test_folder).organize_files(self.sorted_files)
+        fsync_directory.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()